@@ -1,3 +1,4 @@
+import os
 import logging
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -13,13 +14,16 @@ ch = logging.StreamHandler()
 ch.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
 logger.addHandler(ch)
 
-def run_eda():
-    """Run basic EDA: summary stats + histograms."""
+def run_eda(df: pd.DataFrame = None, metrics_dir: str = "reports/metrics", figures_dir: str = "reports/figures"):
+    """Run basic EDA: summary stats + histograms. Loads the raw data if no DataFrame is given."""
     logger.info("Starting EDA")
-    df = load_data()
+    if df is None:
+        df = load_data()
+    os.makedirs(metrics_dir, exist_ok=True)
+    os.makedirs(figures_dir, exist_ok=True)
     # 1. Save summary statistics
     summary = df.describe(include="all")
-    summary_path = "reports/metrics/summary_stats.csv"
+    summary_path = os.path.join(metrics_dir, "summary_stats.csv")
     summary.to_csv(summary_path)
     logger.info(f"Saved summary statistics to {summary_path}")
 
@@ -29,7 +33,7 @@ def run_eda():
         plt.figure()
         df[col].hist(bins=20)
         plt.title(f"{col} Distribution")
-        fig_path = f"reports/figures/{col}_hist.png"
+        fig_path = os.path.join(figures_dir, f"{col}_hist.png")
         plt.savefig(fig_path)
         plt.close()
         logger.info(f"Saved histogram for {col} to {fig_path}")
@@ -20,10 +20,16 @@ def evaluate_model(model_path: str, X_test: pd.DataFrame, y_test: pd.Series, out
     - classification report as JSON
     - confusion matrix as PNG
     """
-    os.makedirs(output_dir, exist_ok=True)
     logger.info("Loading model...")
     model = joblib.load(model_path)
+    return evaluate_fitted_model(model, X_test, y_test, output_dir=output_dir)
 
+def evaluate_fitted_model(model, X_test: pd.DataFrame, y_test: pd.Series, output_dir: str = "reports/metrics") -> dict:
+    """
+    Evaluate an in-memory fitted model on the provided test set,
+    save the same report files as evaluate_model and return the classification report.
+    """
+    os.makedirs(output_dir, exist_ok=True)
     logger.info("Generating predictions...")
     y_pred = model.predict(X_test)
 
@@ -45,6 +51,8 @@ def evaluate_model(model_path: str, X_test: pd.DataFrame, y_test: pd.Series, out
     plt.close()
     logger.info(f"Saved confusion matrix to {cm_path}")
 
+    return report
+
 if __name__ == "__main__":
     from src.data.data_loader import load_data
     from src.features.features import engineer_features
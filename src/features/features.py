@@ -1,7 +1,18 @@
+import ast
+import json
 import logging
+import os
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from src.data.data_loader import load_data
 
+try:
+    import numexpr
+except ImportError:  # numexpr is optional; fall back to plain NumPy evaluation
+    numexpr = None
+
 class FeatureEngineeringError(Exception):
     """Raised when feature engineering fails."""
     pass
@@ -13,29 +24,166 @@ ch = logging.StreamHandler()
 ch.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
 logger.addHandler(ch)
 
-def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
+# Built-in feature set, used when neither config.yaml nor a saved spec provides one
+DEFAULT_FEATURES = {
+    "bill_length_depth_ratio": "bill_length_mm / bill_depth_mm",
+    "mass_flipper_ratio": "body_mass_g / flipper_length_mm",
+}
+
+def feature_spec_path(model_path: str) -> str:
+    """Path of the feature spec saved alongside a model, e.g. models/model.pkl -> models/model_features.json."""
+    return f"{os.path.splitext(model_path)[0]}_features.json"
+
+FEATURE_SPEC_PATH = feature_spec_path("models/model.pkl")
+
+# Functions allowed inside feature expressions (all supported by numexpr too),
+# with the number of positional arguments each one takes
+_FUNCTIONS = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "log1p": np.log1p,
+    "where": np.where,
+}
+_ARG_COUNTS = {name: 1 for name in _FUNCTIONS}
+_ARG_COUNTS["where"] = 3
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name,
+    ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+
+@lru_cache(maxsize=None)
+def _compile_expression(expr: str):
+    """
+    Parse and validate a feature expression.
+    Only expressions that the numexpr and NumPy backends evaluate identically are accepted:
+    - at least one column reference (no constant-only expressions)
+    - numeric, non-boolean constants
+    - whitelisted functions called with their exact number of positional arguments
+    - a single comparison as the first argument of where()
+    Returns the compiled code object and the column names it references.
+    """
+    tree = ast.parse(expr, mode="eval")
+    columns = set()
+    call_names = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise FeatureEngineeringError(f"Unsupported syntax in feature expression: {expr!r}")
+        if isinstance(node, ast.Call):
+            if (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in _FUNCTIONS
+                or node.keywords
+                or len(node.args) != _ARG_COUNTS[node.func.id]
+            ):
+                raise FeatureEngineeringError(f"Unsupported function call in feature expression: {expr!r}")
+            if node.func.id == "where" and not isinstance(node.args[0], ast.Compare):
+                raise FeatureEngineeringError(f"where() needs a comparison as its first argument: {expr!r}")
+            call_names.add(id(node.func))
+        elif isinstance(node, ast.Compare) and len(node.ops) != 1:
+            raise FeatureEngineeringError(f"Chained comparisons are not supported in feature expression: {expr!r}")
+        elif isinstance(node, ast.Name):
+            if node.id in _FUNCTIONS:
+                if id(node) not in call_names:
+                    raise FeatureEngineeringError(f"Function {node.id} must be called in feature expression: {expr!r}")
+            else:
+                columns.add(node.id)
+        elif isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise FeatureEngineeringError(f"Only numeric constants are allowed in feature expression: {expr!r}")
+    if not columns:
+        raise FeatureEngineeringError(f"Feature expression must reference at least one column: {expr!r}")
+    return compile(tree, "<feature>", "eval"), frozenset(columns)
+
+def features_from_config(config: dict) -> dict:
+    """Return the derived feature spec from a loaded config.yaml, or the defaults."""
+    features = (config or {}).get("features", {}).get("derived")
+    return dict(features) if features else dict(DEFAULT_FEATURES)
+
+def save_feature_spec(features: dict, path: str = FEATURE_SPEC_PATH):
+    """Save the feature spec used for training so inference can apply the same set."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(features, f, indent=2)
+    logger.info(f"Saved feature spec to {path}")
+
+def load_feature_spec(path: str = FEATURE_SPEC_PATH) -> dict:
+    """Load a saved feature spec, falling back to the defaults for models trained without one."""
+    if not os.path.exists(path):
+        logger.warning(f"No feature spec found at {path}, using default features")
+        return dict(DEFAULT_FEATURES)
+    with open(path, "r") as f:
+        features = json.load(f)
+    logger.info(f"Loaded feature spec from {path}")
+    return features
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    """Return a read-only view so expression evaluation can never write into the caller's frame."""
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+def engineer_features(df: pd.DataFrame, features: dict = None) -> pd.DataFrame:
     """
-    Add domain-specific features:
-    - bill_length_depth_ratio = bill_length_mm / bill_depth_mm
-    - mass_flipper_ratio      = body_mass_g   / flipper_length_mm
+    Add derived features defined as expressions over existing columns,
+    e.g. {"bill_length_depth_ratio": "bill_length_mm / bill_depth_mm"}.
+    Defaults to DEFAULT_FEATURES.
+
+    Each referenced column is converted to float64 once and shared by all
+    expressions. Every expression is then evaluated vectorized (one numexpr
+    call each, or a NumPy expression copied in when numexpr is missing) into
+    its own column of a single preallocated output block.
+    Untouched columns are not copied and the input frame is not modified.
+    Raises FeatureEngineeringError if a derived name already exists in df.
     """
     try:
         logger.info("Starting feature engineering")
-        df = df.copy()
-        # 1. Compute ratios
-        df["bill_length_depth_ratio"] = df["bill_length_mm"] / df["bill_depth_mm"]
-        df["mass_flipper_ratio"]      = df["body_mass_g"]    / df["flipper_length_mm"]
-        logger.info("Added features: bill_length_depth_ratio and mass_flipper_ratio")
+        features = DEFAULT_FEATURES if features is None else features
+        compiled = {name: _compile_expression(expr) for name, expr in features.items()}
+
+        # 1. Gather each referenced column once as a float64 array
+        needed = set().union(*(cols for _, cols in compiled.values())) if compiled else set()
+        missing = needed - set(df.columns)
+        if missing:
+            raise FeatureEngineeringError(f"Feature expressions reference missing columns: {sorted(missing)}")
+        clashes = [name for name in compiled if name in df.columns]
+        if clashes:
+            raise FeatureEngineeringError(f"Derived feature names already exist as columns: {clashes}")
+        inputs = {col: _read_only(df[col].to_numpy(dtype=np.float64, na_value=np.nan)) for col in needed}
+
+        # 2. Evaluate every expression into its own contiguous column of the output block
+        out = np.empty((len(df), len(compiled)), dtype=np.float64, order="F")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i, (name, (code, _)) in enumerate(compiled.items()):
+                if numexpr is not None:
+                    numexpr.evaluate(features[name], local_dict=inputs, out=out[:, i], casting="unsafe")
+                else:
+                    np.copyto(out[:, i], eval(code, {"__builtins__": {}, **_FUNCTIONS}, inputs))
+
+        # 3. Attach results to a shallow copy so existing column data is shared, not duplicated
+        df = df.copy(deep=False)
+        for i, name in enumerate(compiled):
+            df[name] = out[:, i]
+        logger.info(f"Added features: {', '.join(compiled)}")
         return df
     except Exception as e:
         logger.error(f"Feature engineering failed: {e}")
+        if isinstance(e, FeatureEngineeringError):
+            raise
         raise FeatureEngineeringError from e
 
 if __name__ == "__main__":
     # Quick standalone run
+    from src.config import load_config
+
     df = load_data()
-    feat_df = engineer_features(df)
+    feat_df = engineer_features(df, features_from_config(load_config()))
     out_path = "data/processed/features.csv"
     feat_df.to_csv(out_path, index=False)
     logger.info(f"Saved engineered features to {out_path}")
-
@@ -2,7 +2,7 @@ import logging
 import pandas as pd
 import joblib
 
-from src.features.features import engineer_features
+from src.features.features import engineer_features, feature_spec_path, load_feature_spec
 from src.preprocessing.preprocessing import load_pipeline
 
 logger = logging.getLogger(__name__)
@@ -11,15 +11,16 @@ ch = logging.StreamHandler()
 ch.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
 logger.addHandler(ch)
 
-def run_inference(input_df: pd.DataFrame, model_path: str = "models/model.pkl", pipeline_path: str = "models/preprocessor.pkl") -> pd.Series:
+def run_inference(input_df: pd.DataFrame, model_path: str = "models/model.pkl", pipeline_path: str = "models/preprocessor.pkl", features_path: str = None) -> pd.Series:
     """
     Accepts raw input DataFrame, applies feature engineering and preprocessing,
     loads the trained model and pipeline, and returns predictions.
+    Derived features are taken from the spec saved next to the model at training time.
     """
     logger.info("Running inference pipeline...")
 
-    # 1. Feature engineering
-    df = engineer_features(input_df)
+    # 1. Feature engineering, using the same feature set as training
+    df = engineer_features(input_df, load_feature_spec(features_path or feature_spec_path(model_path)))
 
     # 2. Load pipeline and transform
     pipeline = load_pipeline(pipeline_path)
@@ -6,11 +6,13 @@ import sys
 import pandas as pd
 
 from src.data.data_loader import load_data
-from src.features.features import engineer_features
+from src.config import load_config
+from src.features.features import engineer_features, feature_spec_path, features_from_config, load_feature_spec
 from src.preprocessing.preprocessing import load_pipeline
 from src.models.model import train_and_save_model
 from src.evaluation.evaluation import evaluate_model
 from src.inference.inference import run_inference
+from src.pipeline.pipeline import run_pipeline
 
 from sklearn.model_selection import train_test_split
 
@@ -23,21 +25,29 @@ logger.addHandler(ch)
 
 def run_train():
     logger.info("Running training pipeline...")
+    config = load_config()
     df = load_data()
-    df = engineer_features(df)
-    y = df["species"]
-    df["species"] = y
-    acc = train_and_save_model(df)
+    # Feature engineering happens inside train_and_save_model
+    acc = train_and_save_model(
+        df,
+        output_path=config["model"]["path"],
+        features=features_from_config(config),
+        pipeline_path=config["model"]["preprocessor_path"],
+        test_size=config["model"]["test_size"],
+        random_state=config["model"]["random_state"],
+    )
     logger.info(f"Training completed with accuracy: {acc:.4f}")
 
 def run_eval():
     logger.info("Running evaluation pipeline...")
+    config = load_config()
+    model_path = config["model"]["path"]
     df = load_data()
-    df = engineer_features(df)
+    df = engineer_features(df, load_feature_spec(feature_spec_path(model_path)))
     y = df["species"]
     df["species"] = y
 
-    pipeline = load_pipeline()
+    pipeline = load_pipeline(config["model"]["preprocessor_path"])
     X_proc_array = pipeline.transform(df)
     X_proc = pd.DataFrame(X_proc_array, columns=pipeline.get_feature_names_out(), index=df.index)
 
@@ -45,23 +55,29 @@ def run_eval():
     X_proc = X_proc.drop(columns=drop_cols)
 
     X_train, X_test, y_train, y_test = train_test_split(
-        X_proc, y, test_size=0.2, stratify=y, random_state=42
+        X_proc, y, test_size=config["model"]["test_size"], stratify=y, random_state=config["model"]["random_state"]
     )
-    evaluate_model("models/model.pkl", X_test, y_test)
+    evaluate_model(model_path, X_test, y_test)
 
 def run_infer(input_path):
     logger.info("Running inference pipeline via CLI...")
+    config = load_config()
     df = pd.read_csv(input_path)
-    preds = run_inference(df)
+    preds = run_inference(df, model_path=config["model"]["path"], pipeline_path=config["model"]["preprocessor_path"])
     df["predicted_species"] = preds
     output_path = "data/processed/inference_output.csv"
     df.to_csv(output_path, index=False)
     logger.info(f"Saved inference results to {output_path}")
 
+def run_dag(resume=False):
+    logger.info("Running config-driven pipeline DAG...")
+    run_pipeline(load_config(), resume=resume)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run pipeline operations.")
-    parser.add_argument("--mode", choices=["train", "eval", "infer"], required=True, help="Pipeline step to run")
+    parser.add_argument("--mode", choices=["train", "eval", "infer", "pipeline"], required=True, help="Pipeline step to run")
     parser.add_argument("--input", type=str, help="Input path for inference")
+    parser.add_argument("--resume", action="store_true", help="Resume the pipeline from the last successful stage")
     args = parser.parse_args()
 
     try:
@@ -73,6 +89,8 @@ if __name__ == "__main__":
             if not args.input:
                 raise ValueError("--input is required for inference mode")
             run_infer(args.input)
+        elif args.mode == "pipeline":
+            run_dag(resume=args.resume)
     except Exception as e:
         logger.error(f"Pipeline failed: {e}")
         sys.exit(1)
@@ -7,7 +7,7 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
 from src.data.data_loader import load_data
-from src.features.features import engineer_features
+from src.features.features import DEFAULT_FEATURES, engineer_features, feature_spec_path, save_feature_spec
 from src.preprocessing.preprocessing import build_preprocessing_pipeline, save_pipeline
 
 logger = logging.getLogger(__name__)
@@ -16,43 +16,79 @@ ch = logging.StreamHandler()
 ch.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
 logger.addHandler(ch)
 
-def train_and_save_model(
+def split_and_preprocess(
     df: pd.DataFrame,
     label_col: str = "species",
-    output_path: str = "models/model.pkl"
-) -> float:
-    logger.info("Starting model training")
-
-    # Feature engineering
-    df = engineer_features(df)
+    test_size: float = 0.2,
+    random_state: int = 42
+):
+    """
+    Split an already feature-engineered DataFrame into train/val sets and
+    fit the preprocessing pipeline on the training split only.
+    Returns (pipeline, X_train_proc, X_val_proc, y_train, y_val).
+    """
     y = df[label_col]
     X = df.drop(columns=[label_col])
 
     # Split before preprocessing
-    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=test_size, stratify=y, random_state=random_state)
 
     # Build and fit preprocessing pipeline on X_train only
     pipeline = build_preprocessing_pipeline(X_train)
     X_train_proc = pipeline.fit_transform(X_train)
     X_val_proc = pipeline.transform(X_val)
+    return pipeline, X_train_proc, X_val_proc, y_train, y_val
 
-    # Save fitted pipeline
-    save_pipeline(pipeline)
-
-    # Train model
-    model = RandomForestClassifier(random_state=42)
+def fit_model(X_train_proc, y_train, X_val_proc, y_val, random_state: int = 42):
+    """Train the classifier and score it on the validation split. Returns (model, accuracy)."""
+    model = RandomForestClassifier(random_state=random_state)
     model.fit(X_train_proc, y_train)
 
-    # Evaluate
     y_pred = model.predict(X_val_proc)
     acc = accuracy_score(y_val, y_pred)
     logger.info(f"Accuracy: {acc:.4f}")
+    return model, acc
 
-    # Save model
+def save_model(model, output_path: str = "models/model.pkl"):
+    """Save the trained model to disk."""
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     joblib.dump(model, output_path)
     logger.info(f"Saved trained model to {output_path}")
 
+def train_and_save_model(
+    df: pd.DataFrame,
+    label_col: str = "species",
+    output_path: str = "models/model.pkl",
+    features: dict = None,
+    features_path: str = None,
+    pipeline_path: str = "models/preprocessor.pkl",
+    test_size: float = 0.2,
+    random_state: int = 42
+) -> float:
+    """
+    Engineer features, fit the preprocessing pipeline and classifier, and save them.
+    The feature spec is saved next to the model (see feature_spec_path) unless features_path is given.
+    Returns the validation accuracy.
+    """
+    logger.info("Starting model training")
+
+    # Feature engineering
+    features = DEFAULT_FEATURES if features is None else features
+    df = engineer_features(df, features)
+
+    # Split and preprocess
+    pipeline, X_train_proc, X_val_proc, y_train, y_val = split_and_preprocess(df, label_col, test_size, random_state)
+
+    # Save fitted pipeline and the feature spec it was fitted on
+    save_pipeline(pipeline, pipeline_path)
+    save_feature_spec(features, features_path or feature_spec_path(output_path))
+
+    # Train and evaluate
+    model, acc = fit_model(X_train_proc, y_train, X_val_proc, y_val, random_state)
+
+    # Save model
+    save_model(model, output_path)
+
     return acc
 
 if __name__ == "__main__":
@@ -0,0 +1,307 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import joblib
+import matplotlib
+
+# Stages run on worker threads, so force a non-GUI backend before pyplot is imported
+matplotlib.use("Agg")
+
+from src.data.data_loader import load_data
+from src.data.eda import run_eda
+from src.validation.data_validation import validate_data
+from src.features.features import engineer_features, feature_spec_path, features_from_config, save_feature_spec
+from src.preprocessing.preprocessing import save_pipeline
+from src.models.model import split_and_preprocess, fit_model, save_model
+from src.evaluation.evaluation import evaluate_fitted_model
+
+# Logger setup
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+ch = logging.StreamHandler()
+ch.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+logger.addHandler(ch)
+
+class PipelineError(Exception):
+    """Raised when the pipeline DAG is invalid or a stage fails."""
+    pass
+
+# pyplot keeps global state, so stages that draw figures must not overlap
+_PLOT_LOCK = threading.Lock()
+
+# ---------------------------------------------------------------------------
+# Stages: each takes the loaded config and a dict of upstream outputs by stage name
+# ---------------------------------------------------------------------------
+
+def _stage_load_data(config: dict, inputs: dict):
+    return load_data(config["data"]["raw_path"])
+
+def _stage_validate_data(config: dict, inputs: dict):
+    return validate_data(inputs["load_data"])
+
+def _stage_run_eda(config: dict, inputs: dict):
+    reports = config.get("reports", {})
+    with _PLOT_LOCK:
+        run_eda(
+            inputs["load_data"],
+            metrics_dir=reports.get("metrics_dir", "reports/metrics"),
+            figures_dir=reports.get("figures_dir", "reports/figures"),
+        )
+
+def _stage_engineer_features(config: dict, inputs: dict):
+    features = features_from_config(config)
+    return {"df": engineer_features(inputs["validate_data"], features), "features": features}
+
+def _stage_preprocessing(config: dict, inputs: dict):
+    model_cfg = config["model"]
+    engineered = inputs["engineer_features"]
+    pipeline, X_train_proc, X_val_proc, y_train, y_val = split_and_preprocess(
+        engineered["df"],
+        test_size=model_cfg.get("test_size", 0.2),
+        random_state=model_cfg.get("random_state", 42),
+    )
+    # Artifacts stay in memory; training saves them together with the model
+    return {
+        "pipeline": pipeline,
+        "features": engineered["features"],
+        "X_train": X_train_proc,
+        "X_val": X_val_proc,
+        "y_train": y_train,
+        "y_val": y_val,
+    }
+
+def _stage_training(config: dict, inputs: dict):
+    model_cfg = config["model"]
+    data = inputs["preprocessing"]
+    model, acc = fit_model(
+        data["X_train"], data["y_train"], data["X_val"], data["y_val"],
+        random_state=model_cfg.get("random_state", 42),
+    )
+    # Only replace the live artifacts once the model has been fitted, so they always match
+    save_pipeline(data["pipeline"], model_cfg.get("preprocessor_path", "models/preprocessor.pkl"))
+    save_feature_spec(data["features"], feature_spec_path(model_cfg["path"]))
+    save_model(model, model_cfg["path"])
+    return model
+
+def _stage_evaluate_model(config: dict, inputs: dict):
+    data = inputs["preprocessing"]
+    with _PLOT_LOCK:
+        return evaluate_fitted_model(
+            inputs["training"], data["X_val"], data["y_val"],
+            output_dir=config.get("reports", {}).get("metrics_dir", "reports/metrics"),
+        )
+
+STAGES = {
+    "load_data": _stage_load_data,
+    "validate_data": _stage_validate_data,
+    "run_eda": _stage_run_eda,
+    "engineer_features": _stage_engineer_features,
+    "preprocessing": _stage_preprocessing,
+    "training": _stage_training,
+    "evaluate_model": _stage_evaluate_model,
+}
+
+# Upstream outputs each stage reads; the configured dependencies must include these
+STAGE_INPUTS = {
+    "load_data": [],
+    "validate_data": ["load_data"],
+    "run_eda": ["load_data"],
+    "engineer_features": ["validate_data"],
+    "preprocessing": ["engineer_features"],
+    "training": ["preprocessing"],
+    "evaluate_model": ["preprocessing", "training"],
+}
+
+# Default DAG, used when config.yaml has no pipeline.stages section
+DEFAULT_STAGES = STAGE_INPUTS
+
+# ---------------------------------------------------------------------------
+# DAG construction and execution
+# ---------------------------------------------------------------------------
+
+def build_dag(config: dict) -> dict:
+    """
+    Build the stage DAG from config["pipeline"]["stages"] (stage name -> list of
+    upstream stage names), falling back to DEFAULT_STAGES.
+    Raises PipelineError on unknown stages, unknown dependencies, missing
+    required inputs (see STAGE_INPUTS) or cycles.
+    Returns the DAG as a dict in a valid topological order.
+    """
+    stages = (config or {}).get("pipeline", {}).get("stages") or DEFAULT_STAGES
+    dag = {name: list(deps or []) for name, deps in stages.items()}
+
+    for name, deps in dag.items():
+        if name not in STAGES:
+            raise PipelineError(f"Unknown stage: {name}")
+        missing = [d for d in deps if d not in dag]
+        if missing:
+            raise PipelineError(f"Stage {name} depends on stages not in the pipeline: {missing}")
+        required = [d for d in STAGE_INPUTS[name] if d not in deps]
+        if required:
+            raise PipelineError(f"Stage {name} needs the outputs of {required}; add them to its dependencies")
+
+    # Kahn's algorithm: order stages and detect cycles
+    remaining = {name: set(deps) for name, deps in dag.items()}
+    order = []
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise PipelineError(f"Pipeline has a dependency cycle among: {sorted(remaining)}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return {name: dag[name] for name in order}
+
+def _state_path(checkpoint_dir: str) -> str:
+    return os.path.join(checkpoint_dir, "state.json")
+
+def _checkpoint_path(checkpoint_dir: str, stage: str) -> str:
+    return os.path.join(checkpoint_dir, f"{stage}.pkl")
+
+def _config_hash(config: dict) -> str:
+    """Stable hash of the config, so checkpoints from a different config are never reused."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+def _load_state(checkpoint_dir: str) -> dict:
+    path = _state_path(checkpoint_dir)
+    if not os.path.exists(path):
+        return {"config_hash": None, "completed": [], "aliases": {}}
+    with open(path, "r") as f:
+        state = json.load(f)
+    return {
+        "config_hash": state.get("config_hash"),
+        "completed": state.get("completed", []),
+        "aliases": state.get("aliases", {}),
+    }
+
+def _save_state(checkpoint_dir: str, config_hash: str, completed: list, aliases: dict):
+    with open(_state_path(checkpoint_dir), "w") as f:
+        json.dump({"config_hash": config_hash, "completed": completed, "aliases": aliases}, f, indent=2)
+
+def run_pipeline(config: dict, resume: bool = False) -> dict:
+    """
+    Run the configured stage DAG, executing independent stages concurrently.
+
+    Stage outputs are handed to downstream stages in memory. As soon as a
+    stage finishes its dependents are scheduled, and its output is
+    checkpointed to pipeline.checkpoint_dir in the background; outputs that
+    are just one of the stage's inputs passed through are recorded as an
+    alias instead of being written again. A run with resume=True skips
+    stages whose checkpoints were written and restarts from the first one
+    that was not; if the config has changed since those checkpoints were
+    written, it starts from scratch instead.
+
+    Returns a dict of stage name -> output for the stages run or restored.
+    """
+    dag = build_dag(config)
+    pipeline_cfg = config.get("pipeline", {})
+    max_workers = pipeline_cfg.get("max_workers", 4)
+    checkpoint_dir = pipeline_cfg.get("checkpoint_dir", "models/checkpoints")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    # 1. Restore completed stages when resuming with the same config
+    config_hash = _config_hash(config)
+    completed, aliases = [], {}
+    if resume:
+        state = _load_state(checkpoint_dir)
+        if state["config_hash"] != config_hash:
+            logger.warning("Config changed since the last run; ignoring checkpoints and starting from scratch")
+            state = {"completed": [], "aliases": {}}
+        aliases = {s: a for s, a in state["aliases"].items() if s in dag}
+        completed = [
+            s for s in state["completed"]
+            if s in dag and os.path.exists(_checkpoint_path(checkpoint_dir, aliases.get(s, s)))
+        ]
+        if completed:
+            logger.info(f"Resuming pipeline, skipping completed stages: {completed}")
+    aliases = {s: a for s, a in aliases.items() if s in completed}
+    _save_state(checkpoint_dir, config_hash, completed, aliases)
+
+    # Downstream stages that still have to run need their inputs loaded
+    pending = [s for s in dag if s not in completed]
+    results = {}
+    for stage in completed:
+        if any(stage in dag[p] for p in pending):
+            results[stage] = joblib.load(_checkpoint_path(checkpoint_dir, aliases.get(stage, stage)))
+
+    # 2. Schedule stages as soon as all their dependencies are done;
+    #    checkpoints are written on the executor off the critical path
+    done = set(completed)
+    persisted = set(completed)
+    awaiting_alias = {}
+    running = {}
+    checkpointing = {}
+    failed = None
+
+    def mark_persisted(stage):
+        persisted.add(stage)
+        completed.append(stage)
+        for alias in [a for a, target in awaiting_alias.items() if target == stage]:
+            del awaiting_alias[alias]
+            mark_persisted(alias)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running or checkpointing:
+            if failed is None:
+                for stage in [s for s in pending if all(d in done for d in dag[s])]:
+                    pending.remove(stage)
+                    inputs = {d: results[d] for d in dag[stage]}
+                    logger.info(f"Starting stage: {stage}")
+                    running[executor.submit(STAGES[stage], config, inputs)] = stage
+            if not running and not checkpointing:
+                break
+
+            finished, _ = wait(list(running) + list(checkpointing), return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future in checkpointing:
+                    stage = checkpointing.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.warning(f"Could not checkpoint stage {stage}: {e}")
+                        continue
+                    mark_persisted(stage)
+                    _save_state(checkpoint_dir, config_hash, completed, aliases)
+                    continue
+
+                stage = running.pop(future)
+                try:
+                    results[stage] = future.result()
+                except Exception as e:
+                    logger.error(f"Stage {stage} failed: {e}")
+                    if failed is None:
+                        failed = (stage, e)
+                    continue
+                done.add(stage)
+                logger.info(f"Finished stage: {stage}")
+
+                # Pass-through outputs point at the upstream checkpoint instead of being written again
+                source = next((d for d in dag[stage] if results[d] is results[stage]), None)
+                if source is not None:
+                    aliases[stage] = aliases.get(source, source)
+                    if source in persisted:
+                        mark_persisted(stage)
+                        _save_state(checkpoint_dir, config_hash, completed, aliases)
+                    else:
+                        awaiting_alias[stage] = source
+                else:
+                    path = _checkpoint_path(checkpoint_dir, stage)
+                    checkpointing[executor.submit(joblib.dump, results[stage], path)] = stage
+
+    if failed is not None:
+        stage, e = failed
+        raise PipelineError(f"Stage {stage} failed; rerun with resume to continue from here") from e
+
+    logger.info("Pipeline complete")
+    return results
+
+if __name__ == "__main__":
+    from src.config import load_config
+
+    run_pipeline(load_config())
@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 import joblib
 import logging
@@ -55,6 +56,7 @@ def build_preprocessing_pipeline(df: pd.DataFrame) -> ColumnTransformer:
 
 def save_pipeline(pipeline: ColumnTransformer, path: str = "models/preprocessor.pkl"):
     """Save the fitted preprocessing pipeline to disk."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     joblib.dump(pipeline, path)
     logger.info(f"Saved preprocessing pipeline to {path}")
 
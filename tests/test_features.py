@@ -1,7 +1,13 @@
 import pandas as pd
 import pytest
 
-from src.features.features import engineer_features, FeatureEngineeringError
+from src.features import features as fe
+from src.features.features import (
+    engineer_features,
+    load_feature_spec,
+    save_feature_spec,
+    FeatureEngineeringError,
+)
 from src.data.data_loader import load_data
 
 def test_engineer_features_success():
@@ -30,3 +36,72 @@ def test_engineer_features_failure():
     """
     with pytest.raises(FeatureEngineeringError):
         engineer_features(None)
+
+def test_engineer_features_custom_spec():
+    """
+    A custom feature spec should add exactly those columns
+    and leave the input DataFrame untouched.
+    """
+    df = load_data()
+    features = {
+        "bill_area": "bill_length_mm * bill_depth_mm",
+        "log_mass": "log(body_mass_g)",
+    }
+    feat_df = engineer_features(df, features)
+    assert list(feat_df.columns) == list(df.columns) + ["bill_area", "log_mass"]
+    assert "bill_area" not in df.columns
+    expected = df["bill_length_mm"] * df["bill_depth_mm"]
+    assert feat_df["bill_area"].to_numpy() == pytest.approx(expected.to_numpy(), rel=1e-9)
+
+def test_engineer_features_invalid_expression():
+    """
+    Unsupported syntax, unknown columns or clashing names should raise FeatureEngineeringError.
+    """
+    df = load_data()
+    with pytest.raises(FeatureEngineeringError):
+        engineer_features(df, {"bad": "__import__('os').getcwd()"})
+    with pytest.raises(FeatureEngineeringError):
+        engineer_features(df, {"bad": "not_a_column / 2"})
+    # derived names must not overwrite existing columns (e.g. the label)
+    with pytest.raises(FeatureEngineeringError):
+        engineer_features(df, {"species": "bill_length_mm / bill_depth_mm"})
+    # wrong argument counts, constant-only expressions, non-comparison where() conditions
+    for expr in ["log(bill_length_mm, bill_depth_mm)", "where(bill_length_mm > 40, 1)", "2", "True",
+                 "where(bill_length_mm, 1, 0)", "log + bill_length_mm"]:
+        with pytest.raises(FeatureEngineeringError):
+            engineer_features(df, {"bad": expr})
+
+def test_engineer_features_does_not_modify_input():
+    """
+    Evaluating features must leave every column of the input frame unchanged.
+    """
+    df = load_data()
+    before = df.copy()
+    engineer_features(df, {"bill_area": "bill_length_mm * bill_depth_mm", "log_mass": "log(body_mass_g)"})
+    pd.testing.assert_frame_equal(df, before)
+
+def test_engineer_features_backends_match(monkeypatch):
+    """
+    The numexpr and NumPy backends should produce identical features for the same spec.
+    """
+    pytest.importorskip("numexpr")
+    df = load_data()
+    features = {
+        "ratio": "bill_length_mm / bill_depth_mm",
+        "big_bill": "where(bill_length_mm > 45, 1, 0)",
+        "scaled": "sqrt(abs(body_mass_g - 4000)) + log1p(flipper_length_mm) ** 2",
+        "long_flipper": "flipper_length_mm >= 200",
+    }
+    with_numexpr = engineer_features(df, features)
+    monkeypatch.setattr(fe, "numexpr", None)
+    with_numpy = engineer_features(df, features)
+    pd.testing.assert_frame_equal(with_numexpr, with_numpy)
+
+def test_feature_spec_roundtrip(tmp_path):
+    """
+    A saved feature spec should load back unchanged.
+    """
+    features = {"bill_area": "bill_length_mm * bill_depth_mm"}
+    path = tmp_path / "features.json"
+    save_feature_spec(features, str(path))
+    assert load_feature_spec(str(path)) == features
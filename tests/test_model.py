@@ -8,6 +8,7 @@ def test_train_and_save_model(tmp_path):
     Train a model and ensure:
     - Accuracy is a float between 0 and 1
     - A model file is saved to the specified path
+    - The feature spec is saved next to the model
     """
     df = load_data()
     model_path = tmp_path / "model_test.pkl"
@@ -17,3 +18,4 @@ def test_train_and_save_model(tmp_path):
     assert 0 <= acc <= 1
     assert model_path.exists()
     assert model_path.stat().st_size > 0
+    assert (tmp_path / "model_test_features.json").exists()
@@ -0,0 +1,88 @@
+import pytest
+
+from src.pipeline import pipeline as pl
+from src.pipeline.pipeline import build_dag, run_pipeline, PipelineError
+
+def _config(tmp_path):
+    """Pipeline config that writes every artifact under tmp_path."""
+    return {
+        "data": {"raw_path": "data/raw/penguins_cleaned.csv"},
+        "model": {
+            "path": str(tmp_path / "model.pkl"),
+            "preprocessor_path": str(tmp_path / "preprocessor.pkl"),
+            "test_size": 0.2,
+            "random_state": 42,
+        },
+        "reports": {
+            "metrics_dir": str(tmp_path / "metrics"),
+            "figures_dir": str(tmp_path / "figures"),
+        },
+        "pipeline": {"checkpoint_dir": str(tmp_path / "checkpoints")},
+    }
+
+def test_build_dag_orders_stages():
+    """
+    The default DAG should list every stage after all of its dependencies.
+    """
+    dag = build_dag({})
+    order = list(dag)
+    for stage, deps in dag.items():
+        assert all(order.index(d) < order.index(stage) for d in deps)
+
+def test_build_dag_invalid():
+    """
+    Unknown stages, unknown dependencies, missing required inputs and cycles
+    should raise PipelineError.
+    """
+    with pytest.raises(PipelineError):
+        build_dag({"pipeline": {"stages": {"not_a_stage": []}}})
+    with pytest.raises(PipelineError):
+        build_dag({"pipeline": {"stages": {"validate_data": ["load_data"]}}})
+    with pytest.raises(PipelineError):
+        build_dag({"pipeline": {"stages": {"load_data": ["validate_data"], "validate_data": ["load_data"]}}})
+    # known edges, but engineer_features reads validate_data's output
+    with pytest.raises(PipelineError):
+        build_dag({"pipeline": {"stages": {
+            "load_data": [],
+            "engineer_features": [],
+            "preprocessing": ["engineer_features"],
+        }}})
+
+def test_run_pipeline_resume(tmp_path, monkeypatch):
+    """
+    A failing stage should stop the run without replacing the live model,
+    preprocessor or feature spec; resuming should skip the stages that
+    already succeeded and produce all artifacts.
+    """
+    config = _config(tmp_path)
+    live = [tmp_path / "model.pkl", tmp_path / "preprocessor.pkl", tmp_path / "model_features.json"]
+    for path in live:
+        path.write_text("previous")
+
+    def broken_fit(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(pl, "fit_model", broken_fit)
+    with pytest.raises(PipelineError):
+        run_pipeline(config)
+    assert all(path.read_text() == "previous" for path in live)
+    # validate_data passes its input through, so it is not checkpointed separately
+    assert not (tmp_path / "checkpoints" / "validate_data.pkl").exists()
+
+    monkeypatch.undo()
+    calls = []
+    original_load = pl.STAGES["load_data"]
+    monkeypatch.setitem(pl.STAGES, "load_data", lambda c, i: calls.append("load_data") or original_load(c, i))
+    results = run_pipeline(config, resume=True)
+
+    assert calls == []
+    assert "load_data" not in results
+    assert (tmp_path / "model.pkl").stat().st_size > len("previous")
+    assert (tmp_path / "model_features.json").read_text() != "previous"
+    assert (tmp_path / "metrics" / "classification_report.json").exists()
+    assert (tmp_path / "metrics" / "summary_stats.csv").exists()
+
+    # a config change invalidates the checkpoints
+    config["model"]["random_state"] = 7
+    run_pipeline(config, resume=True)
+    assert calls == ["load_data"]